@@ -8,14 +8,20 @@ BASE_URL = 'https://veranstaltungen.muenchen.de/ferienangebote-familienpass/fami
 # Number of pages to scrape
 TOTAL_PAGES = 4
 
-# Rate limiting settings (in seconds)
-DELAY_BETWEEN_PAGES = 1.0       # Delay between listing pages
-DELAY_BETWEEN_EVENTS = 0.5      # Delay between individual event pages
+# Rate limiting: maximum number of requests started per second (listing and event pages)
+MAX_REQUESTS_PER_SECOND = 2.0
+
+# Maximum number of event pages fetched at the same time
+MAX_CONCURRENT_REQUESTS = 8
 
 # HTTP request settings
 REQUEST_TIMEOUT = 10            # Request timeout in seconds
 MAX_RETRIES = 3                 # Maximum number of retry attempts
 INITIAL_BACKOFF = 2             # Initial backoff delay for retries (in seconds)
+MAX_RETRY_AFTER = 60            # Longest Retry-After delay honoured before a retry (in seconds)
+
+# BeautifulSoup tree builder ('lxml' is C-based; 'html.parser' is the pure-Python fallback)
+HTML_PARSER = 'lxml'
 
 # User-Agent header to identify the scraper
 USER_AGENT = 'Mozilla/5.0 (compatible; FamilienpassScraper/1.0; Educational Purpose)'
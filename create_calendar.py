@@ -6,54 +6,99 @@ Reads the Excel file and creates .ics calendar events for selected events
 
 import hashlib
 import os
-import re
-from datetime import datetime, timedelta
-from openpyxl import load_workbook
-from icalendar import Calendar, Event, Alarm
-from config import CONTINUATION_LINK_MARKER
+import sys
+from datetime import datetime, timedelta, timezone
+from excel_loader import iter_selected_rows
+
+# Output buffer size for the .ics file
+ICS_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# VCALENDAR wrapper; events are streamed in between header and footer
+CALENDAR_HEADER = (
+    b'BEGIN:VCALENDAR\r\n'
+    b'VERSION:2.0\r\n'
+    b'PRODID:-//Familienpass Events//muenchen.de//\r\n'
+)
+CALENDAR_FOOTER = b'END:VCALENDAR\r\n'
+
+# Domain part appended to the hashed UID of every event
+UID_SUFFIX = '@familienpass'
+
+# Maximum length of a content line in octets before it must be folded (RFC 5545, 3.1)
+MAX_LINE_OCTETS = 75
+
+# Escapes for iCalendar TEXT values (RFC 5545, 3.3.11)
+_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n', '\r': None})
+
+# Fixed VEVENT layout: all-day sign-up period with a display alarm at its start.
+# {summary}, {url} and {description} are complete, already folded content lines.
+_VEVENT_TEMPLATE = (
+    'BEGIN:VEVENT\r\n'
+    '{summary}'
+    'DTSTART;VALUE=DATE:{dtstart}\r\n'
+    'DTEND;VALUE=DATE:{dtend}\r\n'
+    'DTSTAMP:{dtstamp}\r\n'
+    'UID:{uid}\r\n'
+    '{url}'
+    'BEGIN:VALARM\r\n'
+    'ACTION:DISPLAY\r\n'
+    '{description}'
+    'TRIGGER:P0D\r\n'
+    'END:VALARM\r\n'
+    'END:VEVENT\r\n'
+)
+
+
+def content_line(line):
+    """
+    Terminate an iCalendar content line, folding it if it is too long
 
+    Args:
+        line: Unfolded content line without line break
 
-def parse_date_range(date_str):
+    Returns:
+        The line with CRLF, split into chunks of at most MAX_LINE_OCTETS octets
+        (continuation chunks start with a space)
     """
-    Parse date string in format "DD.MM.YYYY - DD.MM.YYYY" or "DD.MM.YYYY"
+    if len(line) <= MAX_LINE_OCTETS and line.isascii():
+        return line + '\r\n'
+
+    chunks = []
+    chunk = []
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            chunks.append(''.join(chunk))
+            chunk = []
+            size = 0
+            limit = MAX_LINE_OCTETS - 1  # Leading space of the continuation line
+        chunk.append(char)
+        size += char_size
+    chunks.append(''.join(chunk))
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def open_ics_file(output_path):
+    """
+    Open the .ics output file for sequential buffered writing
 
     Args:
-        date_str: Date string from sign-up period column
+        output_path: Path where .ics file should be saved
 
     Returns:
-        Tuple of (start_date, end_date) as datetime objects, or None if parsing fails
+        Binary file object with an ICS_WRITE_BUFFER_SIZE buffer
     """
-    if not date_str or date_str == 'Not specified':
-        return None
-
-    # Check if it's the direct registration message
-    if 'direkt beim Veranstalter' in date_str:
-        return None
-
-    # Remove any extra whitespace
-    date_str = date_str.strip()
-
-    def parse_date(s):
-        """Parse the first DD.MM.YYYY date from a string, ignoring trailing text."""
-        m = re.match(r'\d{2}\.\d{2}\.\d{4}', s.strip())
-        if m:
-            try:
-                return datetime.strptime(m.group(), '%d.%m.%Y')
-            except ValueError:
-                pass
-        return None
-
-    # Check if it's a range
-    if ' - ' in date_str:
-        parts = date_str.split(' - ', 1)
-        start_date = parse_date(parts[0])
-        end_date = parse_date(parts[1])
-        if start_date and end_date:
-            return (start_date, end_date)
-        return None
-    else:
-        date = parse_date(date_str)
-        return (date, date) if date else None
+    # O_BINARY (Windows only): without it the fd is in text mode and every
+    # CRLF would reach the disk as CR CR LF. 0o666 leaves the umask in charge,
+    # like open() does.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(output_path, flags, 0o666)
+    # Hint sequential access to the kernel where supported (not on macOS/Windows)
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return open(fd, 'wb', buffering=ICS_WRITE_BUFFER_SIZE)
 
 
 def create_calendar_events(excel_path, output_path):
@@ -64,111 +109,65 @@ def create_calendar_events(excel_path, output_path):
         excel_path: Path to the Excel file
         output_path: Path where .ics file should be saved
     """
-    # Load workbook
-    wb = load_workbook(excel_path)
-    ws = wb.active
-
-    # Create calendar
-    cal = Calendar()
-    cal.add('prodid', '-//Familienpass Events//muenchen.de//')
-    cal.add('version', '2.0')
+    # Output file is opened on the first event, so a run without events
+    # leaves an existing calendar file untouched
+    ics_file = None
 
     events_created = 0
     events_skipped = 0
 
-    # Track currently selected event for handling continuation rows
-    current_selected_event = None
-    current_event_url = None
-
-    # Iterate through rows (skip header)
-    for row_num in range(2, ws.max_row + 1):
-        # Column indices (1-based for cells):
-        # A (1): Selected
-        # B (2): Event Name
-        # C (3): Description
-        # D (4): Age
-        # E (5): Place
-        # F (6): Date
-        # G (7): Time
-        # H (8): Sign-Up Period
-
-        selected_cell = ws.cell(row=row_num, column=1)
-        event_name_cell = ws.cell(row=row_num, column=2)
-        sign_up_cell = ws.cell(row=row_num, column=8)
-
-        selected = selected_cell.value
-        event_name = event_name_cell.value
-        sign_up_period = sign_up_cell.value
-
-        # Check if this is a main event row (has event name) or continuation row (↗ or blank)
-        is_continuation = not event_name or str(event_name).strip() in ('', CONTINUATION_LINK_MARKER)
-
-        if not is_continuation:
-            # Main event row - check if selected
-            if selected and str(selected).strip() != '':
-                current_selected_event = event_name
-                current_event_url = event_name_cell.hyperlink.target if event_name_cell.hyperlink else None
-            else:
-                current_selected_event = None
-                current_event_url = None
-
-        # Skip if current event is not selected
-        if not current_selected_event:
-            continue
-
-        # For continuation rows, use this occurrence's URL; otherwise use the main row's URL
-        row_url = (
-            event_name_cell.hyperlink.target
-            if is_continuation and event_name_cell.hyperlink
-            else current_event_url
-        )
-
-        # Parse sign-up period
-        date_range = parse_date_range(sign_up_period)
-
-        if not date_range:
-            if not is_continuation:
-                print(f"  Skipping '{current_selected_event}': No valid sign-up date")
-            events_skipped += 1
-            continue
-
-        start_date, end_date = date_range
-
-        # Create event
-        event = Event()
-        event.add('summary', f'Anmeldung Familienpass: {current_selected_event}')
-        event.add('dtstart', start_date.date())
-        # Add 1 day to end_date because DTEND is exclusive in iCalendar format
-        event.add('dtend', (end_date + timedelta(days=1)).date())
-        event.add('dtstamp', datetime.now())
-
-        # Create stable UID from event name + date range to prevent duplicates on re-import
-        uid_source = f"{current_selected_event}-{start_date.isoformat()}-{end_date.isoformat()}"
-        uid = hashlib.sha256(uid_source.encode()).hexdigest()[:32] + "@familienpass"
-        event.add('uid', uid)
-
-        # Add URL if available
-        if row_url:
-            event.add('url', row_url)
-
-        # Add alarm on the day of the event (at start)
-        alarm = Alarm()
-        alarm.add('action', 'DISPLAY')
-        alarm.add('trigger', timedelta(0))  # 0 = at event start
-        alarm.add('description', f'Anmeldung Familienpass: {current_selected_event}')
-        event.add_component(alarm)
-
-        # Add to calendar
-        cal.add_component(event)
-        events_created += 1
-        print(f"  Created: Anmeldung Familienpass: {current_selected_event} ({start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')})")
-
-    # Save calendar file
-    if events_created > 0:
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-        with open(output_path, 'wb') as f:
-            f.write(cal.to_ical())
+    # Per-event log lines, printed in one write after the loop
+    log_lines = []
+
+    # All events of one run share the same DTSTAMP (UTC, as required by RFC 5545)
+    run_dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    try:
+        for row in iter_selected_rows(excel_path):
+            if row.start_date is None:
+                if not row.is_continuation:
+                    log_lines.append(f"  Skipping '{row.name}': No valid sign-up date")
+                events_skipped += 1
+                continue
+
+            start_date, end_date = row.start_date, row.end_date
+
+            # Create stable UID from event name + date range to prevent duplicates on re-import
+            uid_source = f"{row.name}-{start_date.isoformat()}-{end_date.isoformat()}".encode('utf-8')
+            uid = hashlib.sha256(uid_source).hexdigest()[:32] + UID_SUFFIX
+
+            # Create event with an alarm on the day of the event (at start)
+            title = row.title.translate(_TEXT_ESCAPES)
+            event = _VEVENT_TEMPLATE.format(
+                summary=content_line(f'SUMMARY:{title}'),
+                dtstart=start_date.strftime('%Y%m%d'),
+                # Add 1 day to end_date because DTEND is exclusive in iCalendar format
+                dtend=(end_date + timedelta(days=1)).strftime('%Y%m%d'),
+                dtstamp=run_dtstamp,
+                uid=uid,
+                url=content_line(f'URL:{row.url}') if row.url else '',
+                description=content_line(f'DESCRIPTION:{title}'),
+            )
+
+            # Write event to the calendar file
+            if ics_file is None:
+                os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+                ics_file = open_ics_file(output_path)
+                ics_file.write(CALENDAR_HEADER)
+            ics_file.write(event.encode('utf-8'))
+            events_created += 1
+            log_lines.append(f"  Created: {row.title} ({start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')})")
+
+        if ics_file is not None:
+            ics_file.write(CALENDAR_FOOTER)
+    finally:
+        if ics_file is not None:
+            ics_file.close()
+
+    if log_lines:
+        sys.stdout.write('\n'.join(log_lines) + '\n')
 
+    if events_created > 0:
         print(f"\nCalendar file created: {output_path}")
         print(f"Total events: {events_created}")
         if events_skipped > 0:
@@ -7,95 +7,51 @@ Requires macOS with Reminders access granted to the terminal.
 
 import argparse
 import os
+from collections import namedtuple
 from datetime import datetime
-from openpyxl import load_workbook
-
-from create_calendar import parse_date_range
-from config import CONTINUATION_LINK_MARKER
 
 
 REMINDER_LIST_NAME = "Familienpass"
 
+# Properties of one reminder to be created
+Reminder = namedtuple('Reminder', 'title url sign_up_period date time start_date')
+
 
 def read_selected_events(excel_path):
     """
     Read Excel file and extract selected events with their properties.
 
     Returns:
-        List of dicts with keys: title, url, sign_up_period, date, time, start_date
+        List of Reminder tuples (title, url, sign_up_period, date, time, start_date)
     """
-    wb = load_workbook(excel_path)
-    ws = wb.active
+    # Imported here so --help and argument errors don't pay for loading openpyxl
+    from excel_loader import iter_selected_rows
 
     events = []
-    current_selected_event = None
-    current_event_url = None
-
-    for row_num in range(2, ws.max_row + 1):
-        selected_cell = ws.cell(row=row_num, column=1)
-        event_name_cell = ws.cell(row=row_num, column=2)
-        date_cell = ws.cell(row=row_num, column=6)
-        time_cell = ws.cell(row=row_num, column=7)
-        sign_up_cell = ws.cell(row=row_num, column=8)
-
-        event_name = event_name_cell.value
-        is_continuation = not event_name or str(event_name).strip() in ('', CONTINUATION_LINK_MARKER)
-
-        if not is_continuation:
-            selected = selected_cell.value
-            if selected and str(selected).strip() != '':
-                current_selected_event = event_name
-                current_event_url = (
-                    event_name_cell.hyperlink.target if event_name_cell.hyperlink else None
-                )
-            else:
-                current_selected_event = None
-                current_event_url = None
-
-        if not current_selected_event:
+    for row in iter_selected_rows(excel_path):
+        if row.start_date is None:
+            if not row.is_continuation:
+                print(f"  Skipping '{row.name}': No valid sign-up date")
             continue
 
-        # For continuation rows, use this occurrence's URL; otherwise use the main row's URL
-        row_url = (
-            event_name_cell.hyperlink.target
-            if is_continuation and event_name_cell.hyperlink
-            else current_event_url
-        )
-
-        sign_up_period = sign_up_cell.value
-        date_range = parse_date_range(sign_up_period)
-        if not date_range:
-            if not is_continuation:
-                print(f"  Skipping '{current_selected_event}': No valid sign-up date")
-            continue
-
-        start_date, _ = date_range
-        event_date = date_cell.value or ''
-        event_time = time_cell.value or ''
-
-        events.append({
-            'title': f"Anmeldung Familienpass: {current_selected_event}",
-            'url': row_url,
-            'sign_up_period': sign_up_period,
-            'date': str(event_date).strip(),
-            'time': str(event_time).strip(),
-            'start_date': start_date,
-        })
+        events.append(Reminder(
+            title=row.title,
+            url=row.url,
+            sign_up_period=row.sign_up_period,
+            date=row.date,
+            time=row.time,
+            start_date=row.start_date,
+        ))
 
     return events
 
 
 def build_notes(event):
     """Build reminder notes string from event properties."""
-    lines = []
-    if event['url']:
-        lines.append(event['url'])
-    lines.append(f"Anmeldezeitraum: {event['sign_up_period']}")
-    if event['date']:
-        date_line = f"Datum: {event['date']}"
-        if event['time']:
-            date_line += f", {event['time']}"
-        lines.append(date_line)
+    lines = [event.url] if event.url else []
+    lines.append(f"Anmeldezeitraum: {event.sign_up_period}")
+    if event.date:
+        lines.append(f"Datum: {event.date}, {event.time}" if event.time else f"Datum: {event.date}")
     return '\n'.join(lines)
 
 
@@ -107,9 +63,9 @@ def dry_run(events):
         print(f"--- Reminder {i} ---")
         notes = build_notes(event)
         indented_notes = notes.replace('\n', '\n            ')
-        print(f"  Title:    {event['title']}")
-        print(f"  Due date: {event['start_date'].strftime('%d.%m.%Y')}")
-        print(f"  URL:      {event['url'] or '(none)'}")
+        print(f"  Title:    {event.title}")
+        print(f"  Due date: {event.start_date.strftime('%d.%m.%Y')}")
+        print(f"  URL:      {event.url or '(none)'}")
         print(f"  Notes:    {indented_notes}")
         print()
 
@@ -134,25 +90,68 @@ def ensure_reminder_list(remind):
     return remind.calendars.get(REMINDER_LIST_NAME)
 
 
+def find_ek_calendar(store):
+    """Return the EventKit calendar object of the Familienpass reminder list."""
+    import EventKit
+    for calendar in store.calendarsForEntityType_(EventKit.EKEntityTypeReminder):
+        if calendar.title() == REMINDER_LIST_NAME:
+            return calendar
+    raise ValueError(f"Reminder list '{REMINDER_LIST_NAME}' not found")
+
+
+def due_date_components(due_date):
+    """Convert a datetime into NSDateComponents for an EKReminder due date."""
+    import Foundation
+    components = Foundation.NSDateComponents.alloc().init()
+    components.setYear_(due_date.year)
+    components.setMonth_(due_date.month)
+    components.setDay_(due_date.day)
+    components.setHour_(due_date.hour)
+    components.setMinute_(due_date.minute)
+    return components
+
+
 def create_reminders(events):
-    """Create Apple Reminders for the given events."""
+    """
+    Create Apple Reminders for the given events.
+
+    All reminders are saved without committing and then written to the
+    Reminders database in a single commit, instead of one round-trip per
+    reminder.
+    """
     from pyremindkit import RemindKit
+    import EventKit
 
     remind = RemindKit()
-    target_calendar = ensure_reminder_list(remind)
+    ensure_reminder_list(remind)
+    store = remind._event_store
+    target_calendar = find_ek_calendar(store)
 
-    created = 0
+    pending = []
     for event in events:
-        notes = build_notes(event)
-        target_calendar.create_reminder(
-            title=event['title'],
-            due_date=event['start_date'],
-            notes=notes,
-        )
-        created += 1
-        print(f"  Created: {event['title']} (due {event['start_date'].strftime('%d.%m.%Y')})")
-
-    print(f"\n{created} reminder(s) created in list '{REMINDER_LIST_NAME}'.")
+        reminder = EventKit.EKReminder.reminderWithEventStore_(store)
+        reminder.setTitle_(event.title)
+        reminder.setNotes_(build_notes(event))
+        reminder.setDueDateComponents_(due_date_components(event.start_date))
+        reminder.setCalendar_(target_calendar)
+
+        ok, error = store.saveReminder_commit_error_(reminder, False, None)
+        if not ok:
+            print(f"  ERROR: Could not save '{event.title}': {error}")
+            continue
+        pending.append(event)
+
+    if pending:
+        ok, error = store.commit_(None)
+        if not ok:
+            store.reset()
+            print(f"\nERROR: Could not commit reminders: {error}")
+            return
+
+    for event in pending:
+        print(f"  Created: {event.title} (due {event.start_date.strftime('%d.%m.%Y')})")
+
+    print(f"\n{len(pending)} reminder(s) created in list '{REMINDER_LIST_NAME}'.")
 
 
 def main():
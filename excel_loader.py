@@ -0,0 +1,209 @@
+"""
+Shared Excel reader for the Familienpass calendar and reminder tools
+
+Scans the Excel file once for selected events and caches the result next to
+the workbook, so running both tools only parses the XLSX once.
+"""
+
+import functools
+import os
+import pickle
+import re
+from collections import namedtuple
+from datetime import datetime
+from openpyxl import load_workbook
+from config import CONTINUATION_LINK_MARKER
+
+# Bump when the cached row layout changes
+CACHE_VERSION = 1
+
+# One selected row (main event row or continuation row of a selected event).
+# start_date/end_date are None when the sign-up period could not be parsed.
+SelectedRow = namedtuple(
+    'SelectedRow',
+    'name title url sign_up_period date time start_date end_date is_continuation'
+)
+
+# Column indices (0-based within a row tuple):
+# A (0): Selected, B (1): Event Name, C (2): Description, D (3): Age,
+# E (4): Place, F (5): Date, G (6): Time, H (7): Sign-Up Period
+COL_SELECTED, COL_NAME, COL_DATE, COL_TIME, COL_SIGNUP = 0, 1, 5, 6, 7
+
+# Leading DD.MM.YYYY date of a sign-up period part
+_DATE_RE = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
+
+
+def _parse_date(s):
+    """Parse the first DD.MM.YYYY date from a string, ignoring trailing text."""
+    m = _DATE_RE.match(s.strip())
+    if not m:
+        return None
+    day, month, year = m.groups()
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        # Digit shape matched but the date does not exist (e.g. 30.02.)
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def parse_date_range(date_str):
+    """
+    Parse date string in format "DD.MM.YYYY - DD.MM.YYYY" or "DD.MM.YYYY"
+
+    Results are cached, since many events share the same sign-up period.
+
+    Args:
+        date_str: Date string from sign-up period column
+
+    Returns:
+        Tuple of (start_date, end_date) as datetime objects, or None if parsing fails
+    """
+    if not date_str or date_str == 'Not specified':
+        return None
+
+    # Check if it's the direct registration message
+    if 'direkt beim Veranstalter' in date_str:
+        return None
+
+    # Remove any extra whitespace
+    date_str = date_str.strip()
+
+    # Check if it's a range
+    if ' - ' in date_str:
+        parts = date_str.split(' - ', 1)
+        start_date = _parse_date(parts[0])
+        end_date = _parse_date(parts[1])
+        if start_date and end_date:
+            return (start_date, end_date)
+        return None
+    else:
+        date = _parse_date(date_str)
+        return (date, date) if date else None
+
+
+def _scan_selected_rows(excel_path):
+    """
+    Walk the Excel file and yield a SelectedRow for every selected row
+
+    Args:
+        excel_path: Path to the Excel file
+
+    Yields:
+        SelectedRow for each main row marked in the "Selected" column and
+        each of its continuation rows
+    """
+    # Not read-only: ReadOnlyCell does not expose hyperlinks
+    wb = load_workbook(excel_path, data_only=True)
+    ws = wb.active
+
+    # Track currently selected event for handling continuation rows
+    current_selected_event = None
+    current_event_url = None
+
+    # Local binding for the per-row comparison
+    continuation_marker = CONTINUATION_LINK_MARKER
+
+    # Iterate through rows (skip header)
+    for row in ws.iter_rows(min_row=2, max_col=COL_SIGNUP + 1):
+        event_name_cell = row[COL_NAME]
+        event_name = event_name_cell.value
+
+        # Check if this is a main event row (has event name) or continuation row (↗ or blank).
+        # Cell values are str or None in practice; other types only need the falsy check.
+        if event_name is None:
+            is_continuation = True
+        elif isinstance(event_name, str):
+            stripped = event_name.strip()
+            is_continuation = stripped == '' or stripped == continuation_marker
+        else:
+            is_continuation = not event_name
+
+        if not is_continuation:
+            # Main event row - check if selected
+            selected = row[COL_SELECTED].value
+            if selected and str(selected).strip() != '':
+                current_selected_event = event_name
+                current_event_url = event_name_cell.hyperlink.target if event_name_cell.hyperlink else None
+            else:
+                current_selected_event = None
+                current_event_url = None
+
+        # Skip if current event is not selected
+        if not current_selected_event:
+            continue
+
+        # For continuation rows, use this occurrence's URL; otherwise use the main row's URL
+        row_url = (
+            event_name_cell.hyperlink.target
+            if is_continuation and event_name_cell.hyperlink
+            else current_event_url
+        )
+
+        # Only selected rows get past this point, so the remaining columns
+        # are fetched here rather than for every row
+        sign_up_period = row[COL_SIGNUP].value
+        date_range = parse_date_range(sign_up_period)
+        start_date, end_date = date_range if date_range else (None, None)
+
+        yield SelectedRow(
+            name=current_selected_event,
+            title=f"Anmeldung Familienpass: {current_selected_event}",
+            url=row_url,
+            sign_up_period=sign_up_period,
+            date=str(row[COL_DATE].value or '').strip(),
+            time=str(row[COL_TIME].value or '').strip(),
+            start_date=start_date,
+            end_date=end_date,
+            is_continuation=is_continuation,
+        )
+
+    wb.close()
+
+
+def _cache_path(excel_path):
+    """Return the path of the selected-rows cache belonging to an Excel file."""
+    return os.path.splitext(excel_path)[0] + '.selected.pickle'
+
+
+def _cache_key(excel_path):
+    """Identify the current state of the Excel file by version, mtime and size."""
+    stat = os.stat(excel_path)
+    return (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+
+def iter_selected_rows(excel_path):
+    """
+    Iterate over the selected rows of the Excel file
+
+    The scan result is cached next to the Excel file and reused as long as the
+    workbook has not been modified since.
+
+    Args:
+        excel_path: Path to the Excel file
+
+    Returns:
+        Iterator of SelectedRow
+    """
+    cache_path = _cache_path(excel_path)
+    key = _cache_key(excel_path)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, rows = pickle.load(f)
+        if cached_key == key:
+            return iter(rows)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable cache {cache_path}: {e}")
+
+    rows = list(_scan_selected_rows(excel_path))
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((key, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Warning: Could not write cache {cache_path}: {e}")
+
+    return iter(rows)
@@ -6,100 +6,194 @@ Scrapes event data from Munich Familienpass website and exports to Excel
 
 import os
 import sys
-import time
-from typing import List, Dict, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Dict, Optional, Tuple
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from openpyxl import load_workbook
 
-from config import BASE_URL, TOTAL_PAGES, DELAY_BETWEEN_PAGES, DELAY_BETWEEN_EVENTS, CONTINUATION_LINK_MARKER
-from utils import make_request_with_retry, clean_text, extract_field_by_header
+from config import (
+    BASE_URL, TOTAL_PAGES, CONTINUATION_LINK_MARKER, HTML_PARSER, MAX_CONCURRENT_REQUESTS
+)
+from utils import make_request_with_retry, clean_text, extract_sections, find_section
+from xlsx_writer import Link, write_xlsx
 
+# Chunk size for feeding streamed listing pages to the parser
+LISTING_CHUNK_SIZE = 16384
 
-def parse_listing_page(html_content: str) -> List[Tuple[str, str]]:
+# Event pages are parsed only inside <main>, skipping head, scripts, navigation and footer.
+# A plain h2/h3/p strainer would break the sibling walks, which need the real structure.
+EVENT_CONTENT_STRAINER = SoupStrainer('main')
+
+
+def parse_listing_row(row) -> Optional[Tuple[str, str]]:
     """
-    Parse a single listing page and extract event URLs and dates
+    Extract event URL and date from one row of a listing table
 
     Args:
-        html_content: HTML content of the listing page
+        row: lxml <tr> element
+
+    Returns:
+        Tuple of (event_url, date), or None if the row has no event link
+    """
+    cells = row.xpath('.//td')
+    if len(cells) < 2:
+        return None
+
+    # Extract date from first column
+    date_text = clean_text(''.join(cells[0].itertext()))
+
+    # Extract event URL from second column
+    link = cells[1].find('.//a')
+    if link is None or not link.get('href'):
+        return None
+    event_url = link.get('href')
+
+    # Convert relative URL to absolute if needed
+    if not event_url.startswith('http'):
+        event_url = urljoin('https://veranstaltungen.muenchen.de', event_url)
+
+    return (event_url, date_text)
+
+
+def is_events_table(table) -> bool:
+    """Check whether an lxml <table> element carries the events-table class."""
+    return 'events-table' in (table.get('class') or '').split()
+
+
+def parse_listing_chunks(chunks: Iterable[bytes], encoding: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Parse a listing page from chunks of its HTML and extract event URLs and dates
+
+    Rows are parsed incrementally as the chunks arrive instead of after the
+    whole page has been read and decoded.
+
+    Args:
+        chunks: Raw HTML of the listing page, in chunks
+        encoding: Encoding of the page, if known from the response headers
 
     Returns:
         List of tuples containing (event_url, date)
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
     events = []
+    seen_tables = set()
 
-    # Find ALL tables with events (one per month)
-    tables = soup.find_all('table', class_='events-table')
+    parser = etree.HTMLPullParser(events=('end',), tag='tr', encoding=encoding)
 
-    if not tables:
-        print("  Warning: No tables found on page")
-        return events
+    for chunk in chunks:
+        parser.feed(chunk)
 
-    for table in tables:
-        # Skip header row, iterate through event rows
-        rows = table.find_all('tr')[1:]  # Skip first row (headers)
+        for _, row in parser.read_events():
+            table = next(row.iterancestors('table'), None)
+            if table is None or not is_events_table(table):
+                continue
 
-        for row in rows:
-            cells = row.find_all('td')
-            if len(cells) >= 2:
-                # Extract date from first column
-                date_text = clean_text(cells[0].get_text())
+            # Skip first row of each table (headers)
+            if table not in seen_tables:
+                seen_tables.add(table)
+            else:
+                event = parse_listing_row(row)
+                if event:
+                    events.append(event)
 
-                # Extract event URL from second column
-                link = cells[1].find('a')
-                if link and link.get('href'):
-                    event_url = link.get('href')
+            # Processed rows are not needed anymore
+            row.clear()
 
-                    # Convert relative URL to absolute if needed
-                    if not event_url.startswith('http'):
-                        event_url = urljoin('https://veranstaltungen.muenchen.de', event_url)
+    parser.close()
 
-                    events.append((event_url, date_text))
+    if not seen_tables:
+        print("  Warning: No tables found on page")
 
     return events
 
 
-def get_all_event_urls(base_url: str, total_pages: int = TOTAL_PAGES) -> List[Tuple[str, str]]:
+def stream_parse_listing(url: str) -> List[Tuple[str, str]]:
     """
-    Iterate through all listing pages and collect event URLs
+    Fetch a listing page and extract event URLs and dates while it downloads
+
+    Reading and parsing the body happens inside the retry loop of
+    make_request_with_retry, so a connection dropped or timed out mid-page
+    retries the whole page within the same MAX_RETRIES budget.
+
+    Args:
+        url: URL of the listing page
+
+    Returns:
+        List of tuples containing (event_url, date)
+
+    Raises:
+        requests.exceptions.RequestException: If all retries fail
+    """
+    def read_listing(response):
+        chunks = response.iter_content(chunk_size=LISTING_CHUNK_SIZE)
+        return parse_listing_chunks(chunks, response.encoding)
+
+    return make_request_with_retry(url, stream=True, read_body=read_listing)
+
+
+def cancel_pending(futures: Iterable[Future]) -> None:
+    """
+    Cancel all futures that have not started running yet
+
+    Python 3.8 has no Executor.shutdown(cancel_futures=True), so this is done
+    by hand before the executor waits for the running ones.
+
+    Args:
+        futures: Futures of a ThreadPoolExecutor
+    """
+    for future in futures:
+        future.cancel()
+
+
+def get_all_event_urls(base_url: str, total_pages: int = TOTAL_PAGES,
+                       max_workers: int = MAX_CONCURRENT_REQUESTS) -> List[Tuple[str, str]]:
+    """
+    Fetch all listing pages concurrently and collect event URLs
+
+    Pages are downloaded and parsed in parallel threads (pacing is left to the
+    rate limiter in make_request_with_retry); results are collected in page order.
 
     Args:
         base_url: Base URL of the listing page
         total_pages: Number of pages to scrape
+        max_workers: Maximum number of concurrent requests
 
     Returns:
         List of tuples containing (event_url, date)
     """
     all_events = []
 
-    for page_num in range(1, total_pages + 1):
-        # Construct URL
-        if page_num == 1:
-            url = base_url
-        else:
-            url = f"{base_url}?pno={page_num}"
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+
+        for page_num in range(1, total_pages + 1):
+            # Construct URL
+            if page_num == 1:
+                url = base_url
+            else:
+                url = f"{base_url}?pno={page_num}"
 
-        print(f"Scraping page {page_num}/{total_pages}...")
+            # Fetch page with retry logic, extracting event URLs while it downloads
+            futures.append(executor.submit(stream_parse_listing, url))
 
         try:
-            # Fetch page with retry logic
-            response = make_request_with_retry(url)
-
-            # Parse and extract event URLs
-            events = parse_listing_page(response.text)
-            all_events.extend(events)
+            for page_num, future in enumerate(futures, 1):
+                print(f"Scraping page {page_num}/{total_pages}...")
 
-            print(f"  Found {len(events)} events on this page")
+                try:
+                    events = future.result()
+                    all_events.extend(events)
 
-        except Exception as e:
-            print(f"  ERROR: Failed to scrape page {page_num}: {e}")
+                    print(f"  Found {len(events)} events on this page")
 
-        # Rate limiting - be respectful
-        if page_num < total_pages:
-            time.sleep(DELAY_BETWEEN_PAGES)
+                except Exception as e:
+                    print(f"  ERROR: Failed to scrape page {page_num}: {e}")
+        except BaseException:
+            # E.g. Ctrl-C: don't keep fetching the queued pages while the executor shuts down
+            cancel_pending(futures)
+            raise
 
     return all_events
 
@@ -115,7 +209,10 @@ def parse_event_page(html_content: str, event_url: str) -> Dict[str, str]:
     Returns:
         Dictionary with event data
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=EVENT_CONTENT_STRAINER)
+    if soup.find('h2') is None:
+        # Page without <main> (or title outside it): fall back to the whole document
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
     event_data = {
         'name': '',
@@ -129,28 +226,31 @@ def parse_event_page(html_content: str, event_url: str) -> Dict[str, str]:
     }
 
     try:
+        # Extract all <h3> sections once for the field lookups below
+        sections = extract_sections(soup)
+
         # 1. Extract Name from <h2>
         h2 = soup.find('h2')
         if h2:
             event_data['name'] = clean_text(h2.get_text())
 
         # 2. Extract Age (Alter)
-        event_data['age'] = extract_field_by_header(soup, 'Alter')
+        event_data['age'] = find_section(sections, 'Alter')
 
         # 3. Extract Place (Treffpunkt)
-        event_data['place'] = extract_field_by_header(soup, 'Treffpunkt')
+        event_data['place'] = find_section(sections, 'Treffpunkt')
 
         # 4. Extract Date (Datum)
-        event_data['date'] = extract_field_by_header(soup, 'Datum')
+        event_data['date'] = find_section(sections, 'Datum')
 
         # 5. Extract Time (Uhrzeit)
-        event_data['time'] = extract_field_by_header(soup, 'Uhrzeit')
+        event_data['time'] = find_section(sections, 'Uhrzeit')
 
         # 6. Extract Sign-up information (Verlosungszeitraum or direct registration)
         sign_up = ''
 
         # First, try to find "Anmeldebeginn" section with "Verlosungszeitraum: date range"
-        anmeldebeginn = extract_field_by_header(soup, 'Anmeldebeginn')
+        anmeldebeginn = find_section(sections, 'Anmeldebeginn')
         if anmeldebeginn and 'Verlosungszeitraum' in anmeldebeginn:
             # Extract just the date part after "Verlosungszeitraum:"
             if ':' in anmeldebeginn:
@@ -163,7 +263,7 @@ def parse_event_page(html_content: str, event_url: str) -> Dict[str, str]:
 
         # If no lottery period, check for direct registration with organizer
         if not sign_up:
-            anmeldung = extract_field_by_header(soup, 'Anmeldung')
+            anmeldung = find_section(sections, 'Anmeldung')
             if anmeldung and 'direkt beim Veranstalter' in anmeldung:
                 sign_up = 'Die Anmeldung erfolgt direkt beim Veranstalter.'
 
@@ -174,30 +274,30 @@ def parse_event_page(html_content: str, event_url: str) -> Dict[str, str]:
 
         # Find the first substantial paragraph after h2 but before first h3
         if h2:
-            # Get all siblings after h2
-            current = h2.find_next_sibling()
-            while current:
+            # Walk the siblings after h2 in one pass (text nodes have no name)
+            for sibling in h2.next_siblings:
                 # Stop if we hit a structured section (h3 header)
-                if current.name == 'h3':
+                if sibling.name == 'h3':
                     break
 
                 # Check if it's a paragraph with substantial content
-                if current.name == 'p':
-                    text = clean_text(current.get_text())
+                if sibling.name == 'p':
+                    text = clean_text(sibling.get_text())
                     if len(text) > 50:  # Substantial content
                         description = text
                         break
 
-                current = current.find_next_sibling()
-
-        # Fallback: try to find any substantial paragraph
+        # Fallback: try to find any substantial paragraph.
+        # Walk the paragraphs in document order and stop at the first hit
+        # instead of collecting all of them with find_all.
         if not description:
-            paragraphs = soup.find_all('p')
-            for p in paragraphs:
+            p = soup.find('p')
+            while p is not None:
                 text = clean_text(p.get_text())
                 if len(text) > 50:  # Substantial content
                     description = text
                     break
+                p = p.find_next('p')
 
         event_data['description'] = description if description else 'No description available'
 
@@ -248,6 +348,53 @@ def scrape_event_details(event_url: str, listing_date: str = '') -> Dict[str, st
         }
 
 
+def scrape_all_event_details(event_urls: List[Tuple[str, str]],
+                             max_workers: int = MAX_CONCURRENT_REQUESTS) -> List[Dict[str, str]]:
+    """
+    Scrape all event pages with a bounded number of requests in flight
+
+    Request pacing is left to the rate limiter in make_request_with_retry, so
+    a slow response does not hold back the following events.
+
+    A multi-date event is listed once per date, but its detail page is the same
+    for all of them: every URL is fetched only once and the result is copied
+    for each listing entry.
+
+    Args:
+        event_urls: List of tuples containing (event_url, listing_date)
+        max_workers: Maximum number of concurrent requests
+
+    Returns:
+        List of event dictionaries, in the same order as event_urls
+    """
+    unique_urls = list(dict.fromkeys(url for url, _ in event_urls))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {url: executor.submit(scrape_event_details, url) for url in unique_urls}
+
+        try:
+            # Report progress as pages finish, not when they are queued
+            for idx, future in enumerate(as_completed(futures.values()), 1):
+                print(f"Event {idx}/{len(unique_urls)} done")
+        except BaseException:
+            # E.g. Ctrl-C: don't keep fetching the queued pages while the executor shuts down
+            cancel_pending(futures.values())
+            raise
+
+    events_data = []
+    for url, listing_date in event_urls:
+        # scrape_event_details handles its own errors, so result() does not raise
+        event_data = dict(futures[url].result())
+
+        # Use listing date as fallback if detail page date missing
+        if not event_data['date'] and listing_date:
+            event_data['date'] = listing_date
+
+        events_data.append(event_data)
+
+    return events_data
+
+
 def load_existing_selections(filepath: str) -> dict:
     """Load existing selections from Excel file, mapping event name to selection value."""
     selections = {}
@@ -255,11 +402,10 @@ def load_existing_selections(filepath: str) -> dict:
         return selections
 
     try:
-        wb = load_workbook(filepath)
+        # Read-only streaming pass over plain values of columns A (selected) and B (event name)
+        wb = load_workbook(filepath, read_only=True, data_only=True)
         ws = wb.active
-        for row_num in range(2, ws.max_row + 1):
-            selected = ws.cell(row=row_num, column=1).value  # Column A
-            event_name = ws.cell(row=row_num, column=2).value  # Column B
+        for selected, event_name in ws.iter_rows(min_row=2, max_col=2, values_only=True):
             if event_name and selected and str(selected).strip():
                 selections[event_name] = selected
         wb.close()
@@ -269,6 +415,23 @@ def load_existing_selections(filepath: str) -> dict:
     return selections
 
 
+def date_sort_key(date_str: str) -> Tuple[int, int, int]:
+    """
+    Convert DD.MM.YYYY to a numeric sort key (YYYY, MM, DD)
+
+    Args:
+        date_str: Event date string
+
+    Returns:
+        Tuple of ints; unknown or malformed dates sort last
+    """
+    parts = date_str.split('.') if isinstance(date_str, str) else []
+    # isdecimal, not isdigit: digits like '²' pass isdigit but make int() raise
+    if len(parts) == 3 and all(part.isdecimal() for part in parts):
+        return (int(parts[2]), int(parts[1]), int(parts[0]))
+    return (9999, 99, 99)  # Unknown dates sort last
+
+
 def group_events_by_name(events_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """
     Group events by name and create continuation rows for multi-date events.
@@ -282,31 +445,16 @@ def group_events_by_name(events_data: List[Dict[str, str]]) -> List[Dict[str, st
     Returns:
         List of event dictionaries with continuation rows marked
     """
-    from collections import OrderedDict
-
-    # Group events by name, preserving order of first occurrence
-    grouped = OrderedDict()
+    # Group events by name, preserving order of first occurrence (dicts keep insertion order)
+    grouped = {}
     for event in events_data:
-        name = event['name']
-        if name not in grouped:
-            grouped[name] = []
-        grouped[name].append(event)
-
-    def parse_date_for_sort(date_str: str) -> tuple:
-        """Convert DD.MM.YYYY to sortable tuple (YYYY, MM, DD)."""
-        try:
-            parts = date_str.split('.')
-            if len(parts) == 3:
-                return (parts[2], parts[1], parts[0])
-        except (AttributeError, IndexError):
-            pass
-        return ('9999', '99', '99')  # Unknown dates sort last
+        grouped.setdefault(event['name'], []).append(event)
 
     # Build result with continuation rows
     result = []
     for name, occurrences in grouped.items():
         # Sort occurrences by date for consistent ordering
-        occurrences.sort(key=lambda e: parse_date_for_sort(e.get('date', '')))
+        occurrences.sort(key=lambda e: date_sort_key(e.get('date', '')))
 
         for idx, event in enumerate(occurrences):
             if idx == 0:
@@ -346,11 +494,6 @@ def save_to_excel(events_data: List[Dict[str, str]], output_path: str, selection
     # Group events by name (multi-date events get continuation rows)
     grouped_events = group_events_by_name(events_data)
 
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Familienpass Events"
-
     # Define column headers with "Selected" as first column
     headers = [
         'Selected',
@@ -363,68 +506,6 @@ def save_to_excel(events_data: List[Dict[str, str]], output_path: str, selection
         'Sign-Up Period (Verlosungszeitraum)'
     ]
 
-    # Write headers with formatting
-    header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-    header_alignment = Alignment(horizontal='center', vertical='top', wrap_text=True)
-
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.value = header
-        cell.font = Font(bold=True, size=12, color='FFFFFF')
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    # Write data rows
-    for row_num, event in enumerate(grouped_events, 2):
-        is_continuation = event.get('is_continuation', False)
-
-        if is_continuation:
-            # Continuation row: only date/time/sign-up period (no selection)
-            ws.cell(row=row_num, column=1).alignment = Alignment(wrap_text=True, vertical='top')
-
-            # Column 2: "Link" as hyperlink to this occurrence's event URL
-            link_cell = ws.cell(row=row_num, column=2, value=CONTINUATION_LINK_MARKER)
-            link_cell.hyperlink = event['event_url']
-            link_cell.font = Font(color='0563C1', underline='single')
-            link_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-            ws.cell(row=row_num, column=3).alignment = Alignment(wrap_text=True, vertical='top')
-            ws.cell(row=row_num, column=4).alignment = Alignment(wrap_text=True, vertical='top')
-            ws.cell(row=row_num, column=5).alignment = Alignment(wrap_text=True, vertical='top')
-        else:
-            # First row: full event info with selection
-            selection_value = selections.get(event['name'], '')
-            selected_cell = ws.cell(row=row_num, column=1, value=selection_value)
-            selected_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-            # Column 2: Event Name (as hyperlink)
-            name_cell = ws.cell(row=row_num, column=2, value=event['name'])
-            name_cell.hyperlink = event['event_url']
-            name_cell.font = Font(color='0563C1', underline='single')
-            name_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-            # Column 3: Description
-            desc_cell = ws.cell(row=row_num, column=3, value=event['description'])
-            desc_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-            # Column 4: Age
-            age_cell = ws.cell(row=row_num, column=4, value=event['age'])
-            age_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-            # Column 5: Place
-            place_cell = ws.cell(row=row_num, column=5, value=event['place'])
-            place_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-        # Date/Time/Sign-up always filled (for both first and continuation rows)
-        date_cell = ws.cell(row=row_num, column=6, value=event['date'])
-        date_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-        time_cell = ws.cell(row=row_num, column=7, value=event['time'])
-        time_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-        signup_cell = ws.cell(row=row_num, column=8, value=event['sign_up_date'])
-        signup_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
     # Set column widths (with Selected column first)
     column_widths = {
         'A': 10.0,         # Selected
@@ -437,20 +518,48 @@ def save_to_excel(events_data: List[Dict[str, str]], output_path: str, selection
         'H': 22.33203125   # Sign-Up Period
     }
 
-    for col, width in column_widths.items():
-        ws.column_dimensions[col].width = width
-
-    # Freeze header row
-    ws.freeze_panes = 'A2'
-
-    # Set zoom level to 150%
-    ws.sheet_view.zoomScale = 150
+    def build_rows():
+        """Yield one row of cell values per (grouped) event."""
+        for event in grouped_events:
+            is_continuation = event.get('is_continuation', False)
+
+            if is_continuation:
+                # Continuation row: only date/time/sign-up period (no selection).
+                # Empty columns are left out entirely instead of writing style-only cells.
+                row = [
+                    None,
+                    # Column 2: "Link" as hyperlink to this occurrence's event URL
+                    Link(CONTINUATION_LINK_MARKER, event['event_url']),
+                    None,
+                    None,
+                    None,
+                ]
+            else:
+                # First row: full event info with selection
+                row = [
+                    selections.get(event['name'], ''),
+                    # Column 2: Event Name (as hyperlink)
+                    Link(event['name'], event['event_url']),
+                    # Column 3: Description
+                    event['description'],
+                    # Column 4: Age
+                    event['age'],
+                    # Column 5: Place
+                    event['place'],
+                ]
+
+            # Date/Time/Sign-up always filled (for both first and continuation rows)
+            row.append(event['date'])
+            row.append(event['time'])
+            row.append(event['sign_up_date'])
+
+            yield row
 
     # Create output directory if needed
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    # Save workbook
-    wb.save(output_path)
+    # Save workbook: frozen header row, zoom level 150%
+    write_xlsx(output_path, "Familienpass Events", headers, build_rows(), column_widths, zoom=150)
     print(f"Excel file saved: {output_path}")
 
 
@@ -475,16 +584,7 @@ def main():
 
         # Step 2: Scrape each event
         print("Step 2: Scraping individual event details...")
-        events_data = []
-
-        for idx, (url, listing_date) in enumerate(event_urls, 1):
-            print(f"Event {idx}/{len(event_urls)}")
-            event_data = scrape_event_details(url, listing_date)
-            events_data.append(event_data)
-
-            # Rate limiting
-            if idx < len(event_urls):
-                time.sleep(DELAY_BETWEEN_EVENTS)
+        events_data = scrape_all_event_details(event_urls)
 
         # Step 3: Save to Excel
         print("\nStep 3: Saving to Excel...")
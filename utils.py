@@ -4,37 +4,138 @@ Utility functions for the Familienpass Event Scraper
 
 import time
 import re
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Optional, TypeVar, Union
 from bs4 import BeautifulSoup, Tag
-from config import USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES, INITIAL_BACKOFF
+from config import (
+    BASE_URL, USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES, INITIAL_BACKOFF, MAX_RETRY_AFTER,
+    MAX_REQUESTS_PER_SECOND, MAX_CONCURRENT_REQUESTS
+)
+
+# Shared session: keeps connections to the (single) target host alive across
+# requests instead of doing a new TCP + TLS handshake per page.
+# The pool for that host keeps one connection per concurrent request; the
+# thread pools in the scraper never run more requests than that at once.
+# It does not block when exhausted (requests has no pool timeout), so a
+# connection that is not returned cannot stall all later requests.
+# Retries are handled by make_request_with_retry, not by the adapter.
+_TARGET_ORIGIN = '{0.scheme}://{0.netloc}/'.format(urlsplit(BASE_URL))
+_SESSION = requests.Session()
+_SESSION.mount(_TARGET_ORIGIN, HTTPAdapter(
+    pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=0
+))
+_SESSION.headers.update({'User-Agent': USER_AGENT})
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how often requests are started
+
+    Each acquire() takes one token; tokens refill at `rate` per second up to
+    `capacity`. Callers that find the bucket empty reserve a future token and
+    sleep until it is due, so concurrent callers are spaced out evenly.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be started"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by all requests to the target host, including concurrent ones
+_LIMITER = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+# Result type of the read_body callback of make_request_with_retry
+T = TypeVar('T')
+
+# Runs of whitespace (including newlines) collapsed by clean_text
+_WS_RE = re.compile(r'\s+')
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Read the Retry-After header of a response
+
+    Args:
+        response: Response of a throttled request (HTTP 429/503)
+
+    Returns:
+        Seconds to wait before retrying, or None if the header is absent or invalid
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    value = value.strip()
+    # isdecimal, not isdigit: digits like '²' pass isdigit but make float() raise
+    if value.isdecimal():
+        return float(value)
+
+    # HTTP-date form
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None or retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
 
 
 def make_request_with_retry(url: str, max_retries: int = MAX_RETRIES,
-                            delay: int = INITIAL_BACKOFF) -> requests.Response:
+                            delay: int = INITIAL_BACKOFF, stream: bool = False,
+                            read_body: Optional[Callable[[requests.Response], T]] = None
+                            ) -> Union[requests.Response, T]:
     """
-    Make HTTP request with retry logic and exponential backoff
+    Make HTTP request with rate limiting, retry logic and exponential backoff
+
+    Every attempt waits for the shared rate limiter first. Throttled requests
+    (HTTP 429/503) are retried after the server's Retry-After delay (capped at
+    MAX_RETRY_AFTER), or with exponential backoff if the server does not send one.
 
     Args:
         url: URL to fetch
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of attempts, including reading the body via read_body
         delay: Initial delay between retries (doubles on each retry)
+        stream: Return as soon as the headers arrive and read the body lazily
+        read_body: Optional function consuming the response inside the retry loop,
+            so a connection dropped while reading the body is retried like any
+            other network error. The response is closed afterwards.
 
     Returns:
-        Response object
+        Response object, or the result of read_body if given
 
     Raises:
         requests.exceptions.RequestException: If all retries fail
     """
     for attempt in range(max_retries):
         try:
-            response = requests.get(
-                url,
-                headers={'User-Agent': USER_AGENT},
-                timeout=REQUEST_TIMEOUT
-            )
+            _LIMITER.acquire()
+            response = _SESSION.get(url, timeout=REQUEST_TIMEOUT, stream=stream)
             response.raise_for_status()
-            return response
+            if read_body is None:
+                return response
+
+            # Closes the response (releasing its connection) on success and on failure
+            with response:
+                return read_body(response)
 
         except requests.exceptions.Timeout:
             print(f"  Timeout on attempt {attempt + 1}/{max_retries}")
@@ -44,11 +145,18 @@ def make_request_with_retry(url: str, max_retries: int = MAX_RETRIES,
                 raise
 
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code in [429, 503]:  # Rate limit or service unavailable
-                print(f"  Server busy (HTTP {e.response.status_code}), waiting...")
-                time.sleep(delay * 2)
-                if attempt < max_retries - 1:
-                    continue
+            # Release the connection of the failed (possibly streamed) response
+            e.response.close()
+
+            if e.response.status_code in [429, 503] and attempt < max_retries - 1:  # Rate limit or service unavailable
+                wait = retry_after_seconds(e.response)
+                if wait is None:
+                    wait = delay * (2 ** attempt)  # Exponential backoff
+                # Don't let the server park a worker thread for hours
+                wait = min(wait, MAX_RETRY_AFTER)
+                print(f"  Server busy (HTTP {e.response.status_code}), waiting {wait:.0f}s...")
+                time.sleep(wait)
+                continue
             raise
 
         except requests.exceptions.RequestException as e:
@@ -74,19 +182,75 @@ def clean_text(text: str) -> str:
     if not text:
         return ''
 
-    # Remove extra whitespace and newlines
-    text = re.sub(r'\s+', ' ', text)
+    # Collapse extra whitespace and newlines, strip leading/trailing whitespace
+    return _WS_RE.sub(' ', text).strip()
 
-    # Strip leading/trailing whitespace
-    text = text.strip()
 
-    return text
+def extract_sections(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+    """
+    Extract the content following every <h3> header of a page in one pass
+
+    The content of a section is the text of the header's next sibling element;
+    if there is none, the text of all following siblings up to the next <h3>.
+
+    Args:
+        soup: BeautifulSoup object of the page
+
+    Returns:
+        Dict mapping lowercased header text to cleaned section content
+        (None if the section has no content), in document order
+    """
+    sections = {}
+
+    for header in soup.find_all('h3'):
+        # Get next sibling content
+        next_elem = header.find_next_sibling()
+
+        if next_elem:
+            content = clean_text(next_elem.get_text())
+        else:
+            # Alternative: get all text until next header
+            texts = []
+            for sibling in header.next_siblings:
+                if sibling.name == 'h3':
+                    break
+                if hasattr(sibling, 'get_text'):
+                    texts.append(sibling.get_text())
+            content = clean_text(' '.join(texts)) if texts else None
+
+        # Keep the first section with content for repeated headers
+        key = header.get_text().lower()
+        if sections.get(key) is None:
+            sections[key] = content
+
+    return sections
+
+
+def find_section(sections: Dict[str, Optional[str]], header_text: str) -> str:
+    """
+    Look up section content by (part of) its header text
+
+    Args:
+        sections: Sections from extract_sections
+        header_text: Text to search for in the headers (case-insensitive)
+
+    Returns:
+        Content of the first matching section with content, or empty string if not found
+    """
+    needle = header_text.lower()
+    for key, content in sections.items():
+        if needle in key and content is not None:
+            return content
+    return ''
 
 
 def extract_field_by_header(soup: BeautifulSoup, header_text: str) -> str:
     """
     Find <h3> header with specific text and extract following content
 
+    To look up several fields of the same page, call extract_sections once and
+    use find_section instead.
+
     Args:
         soup: BeautifulSoup object of the page
         header_text: Text to search for in <h3> headers
@@ -95,29 +259,7 @@ def extract_field_by_header(soup: BeautifulSoup, header_text: str) -> str:
         Cleaned text content following the header, or empty string if not found
     """
     try:
-        # Find all h3 headers
-        headers = soup.find_all('h3')
-
-        for header in headers:
-            if header_text.lower() in header.get_text().lower():
-                # Get next sibling content
-                next_elem = header.find_next_sibling()
-
-                if next_elem:
-                    return clean_text(next_elem.get_text())
-
-                # Alternative: get all text until next header
-                content = []
-                for sibling in header.next_siblings:
-                    if sibling.name == 'h3':
-                        break
-                    if hasattr(sibling, 'get_text'):
-                        content.append(sibling.get_text())
-
-                if content:
-                    return clean_text(' '.join(content))
-
-        return ''
+        return find_section(extract_sections(soup), header_text)
 
     except Exception as e:
         print(f"    Warning: Could not extract {header_text}: {e}")
@@ -0,0 +1,248 @@
+"""
+Minimal XLSX writer for the Familienpass event table
+
+Writes a single-sheet workbook directly as SpreadsheetML: inline strings, a
+fixed set of cell styles (header, wrapped text, hyperlink), column widths, a
+frozen header row and hyperlinks. The sheet XML is streamed row by row into
+the zip archive, so no cell objects are kept in memory.
+"""
+
+import re
+import zipfile
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+# Cell showing text as a hyperlink to url
+Link = namedtuple('Link', 'text url')
+
+# Indices into cellXfs of STYLES_XML
+STYLE_HEADER = 1
+STYLE_WRAP = 2
+STYLE_LINK = 3
+
+# Characters not allowed in XML 1.0 (the same ones openpyxl rejects)
+_ILLEGAL_XML_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_XML_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<bookViews><workbookView/></bookViews>'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+# Fonts: default, header (bold white 12pt), link (blue underlined).
+# Fills 0 and 1 are reserved by Excel; fill 2 is the header background.
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="12"/><color rgb="00FFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><u/><sz val="11"/><color rgb="000563C1"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00366092"/><bgColor rgb="00366092"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" '
+    'applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="top" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">'
+    '<alignment vertical="top" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+    '<alignment vertical="top" wrapText="1"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+SHEET_XML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+)
+
+# Header row frozen: the visible area starts at A2
+SHEET_VIEWS_TEMPLATE = (
+    '<sheetViews><sheetView workbookViewId="0" zoomScale="{zoom}">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+    '</sheetView></sheetViews>'
+)
+
+HYPERLINK_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+
+def column_letter(index: int) -> str:
+    """
+    Convert a 1-based column index into its letter(s)
+
+    Args:
+        index: Column index (1 = A)
+
+    Returns:
+        Column letter(s), e.g. 'A', 'Z', 'AA'
+    """
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letter: str) -> int:
+    """Convert column letter(s) into the 1-based column index."""
+    index = 0
+    for char in letter.upper():
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def cell_xml(ref: str, value, style: int) -> str:
+    """
+    Build the XML of one cell
+
+    Args:
+        ref: Cell reference, e.g. 'B2'
+        value: Cell value (str, number, bool; None or '' for a style-only cell)
+        style: Index into cellXfs
+
+    Returns:
+        <c> element as string
+    """
+    if value is None or value == '':
+        return f'<c r="{ref}" s="{style}"/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" s="{style}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}" s="{style}"><v>{value!r}</v></c>'
+
+    text = _ILLEGAL_XML_CHARS_RE.sub('', str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def write_xlsx(path: str, sheet_title: str, headers: List[str], rows: Iterable[List],
+               column_widths: Optional[Dict[str, float]] = None, zoom: int = 100) -> None:
+    """
+    Write a single-sheet workbook with a styled, frozen header row
+
+    Data cells are wrapped and top-aligned; Link values are written as
+    hyperlinks. None values in a row leave the cell out.
+
+    Args:
+        path: Path of the .xlsx file
+        sheet_title: Name of the worksheet
+        headers: Header row values
+        rows: Data rows, each a list of cell values or Link tuples
+        column_widths: Dict mapping column letter to width
+        zoom: Zoom level of the sheet in percent
+    """
+    column_letters = [column_letter(i) for i in range(1, len(headers) + 1)]
+
+    # (cell reference, url) of every hyperlink, written after the sheet data
+    hyperlinks = []
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', CONTENT_TYPES_XML)
+        zf.writestr('_rels/.rels', ROOT_RELS_XML)
+        zf.writestr('xl/workbook.xml', WORKBOOK_XML_TEMPLATE.format(name=quoteattr(sheet_title)))
+        zf.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_XML)
+        zf.writestr('xl/styles.xml', STYLES_XML)
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            parts = [SHEET_XML_HEADER, SHEET_VIEWS_TEMPLATE.format(zoom=zoom)]
+
+            if column_widths:
+                parts.append('<cols>')
+                for letter, width in sorted(column_widths.items(), key=lambda item: column_index(item[0])):
+                    idx = column_index(letter)
+                    parts.append(f'<col min="{idx}" max="{idx}" width="{width!r}" customWidth="1"/>')
+                parts.append('</cols>')
+
+            parts.append('<sheetData><row r="1">')
+            for letter, header in zip(column_letters, headers):
+                parts.append(cell_xml(f'{letter}1', header, STYLE_HEADER))
+            parts.append('</row>')
+            sheet.write(''.join(parts).encode('utf-8'))
+
+            for row_num, row in enumerate(rows, start=2):
+                parts = [f'<row r="{row_num}">']
+                for letter, value in zip(column_letters, row):
+                    if value is None:
+                        continue
+                    ref = f'{letter}{row_num}'
+                    if isinstance(value, Link):
+                        parts.append(cell_xml(ref, value.text, STYLE_LINK))
+                        if value.url:
+                            hyperlinks.append((ref, value.url))
+                    else:
+                        parts.append(cell_xml(ref, value, STYLE_WRAP))
+                parts.append('</row>')
+                sheet.write(''.join(parts).encode('utf-8'))
+
+            parts = ['</sheetData>']
+            if hyperlinks:
+                parts.append('<hyperlinks>')
+                for rel_id, (ref, _) in enumerate(hyperlinks, start=1):
+                    parts.append(f'<hyperlink ref="{ref}" r:id="rId{rel_id}"/>')
+                parts.append('</hyperlinks>')
+            parts.append('<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>')
+            parts.append('</worksheet>')
+            sheet.write(''.join(parts).encode('utf-8'))
+
+        if hyperlinks:
+            parts = [
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            ]
+            for rel_id, (_, url) in enumerate(hyperlinks, start=1):
+                parts.append(
+                    f'<Relationship Id="rId{rel_id}" Type="{HYPERLINK_REL_TYPE}" '
+                    f'Target={quoteattr(url)} TargetMode="External"/>'
+                )
+            parts.append('</Relationships>')
+            zf.writestr('xl/worksheets/_rels/sheet1.xml.rels', ''.join(parts))